@@ -0,0 +1,87 @@
+import json
+from typing import List, Union
+from app.exceptions import MalformedMessage
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # optional, falls back to the stdlib parser
+    _loads = json.loads
+
+
+class DepthUpdate():
+    """
+    Compact diff depth update. Supports message['U'] style access so it can be used
+    anywhere the manager used the decoded dict.
+    """
+    __slots__ = ('E', 's', 'U', 'u', 'b', 'a')
+
+    def __init__(self, E: int, s: str, U: int, u: int, b: List[List[str]], a: List[List[str]]) -> None:
+        self.E = E
+        self.s = s
+        self.U = U
+        self.u = u
+        self.b = b
+        self.a = a
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DepthUpdate):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"DepthUpdate(s={self.s}, U={self.U}, u={self.u}, bids={len(self.b)}, asks={len(self.a)})"
+
+
+class JsonDecoder():
+    # plain json.loads into a dict
+    def decode(self, message: Union[str, bytes]):
+        return json.loads(message)
+
+
+class DepthUpdateDecoder():
+    """
+    Decodes frames with orjson (when installed) into DepthUpdate objects and rejects anything
+    that is not a well formed depth update by raising MalformedMessage, so bad frames never
+    reach the manager. Combined stream frames ({"stream": ..., "data": {...}}) are unwrapped.
+    """
+    def decode(self, message: Union[str, bytes]) -> DepthUpdate:
+        try:
+            data = _loads(message)
+        except ValueError as e:
+            raise MalformedMessage(f"invalid json: {e}")
+
+        if isinstance(data, dict) and 'data' in data and 'stream' in data:
+            data = data['data']
+        return self.from_dict(data)
+
+    @staticmethod
+    def from_dict(data: dict) -> DepthUpdate:
+        try:
+            if data['e'] != 'depthUpdate':
+                raise MalformedMessage(f"unexpected event type {data['e']}")
+            U, u, b, a = data['U'], data['u'], data['b'], data['a']
+        except (KeyError, TypeError) as e:
+            raise MalformedMessage(f"missing field {e}")
+
+        if type(U) is not int or type(u) is not int or u < U:
+            raise MalformedMessage(f"invalid update ids U:{U} u:{u}")
+        if type(b) is not list or type(a) is not list:
+            raise MalformedMessage("bids and asks should be lists")
+        for level in b:
+            if type(level) is not list or len(level) != 2:
+                raise MalformedMessage(f"invalid bid level {level}")
+        for level in a:
+            if type(level) is not list or len(level) != 2:
+                raise MalformedMessage(f"invalid ask level {level}")
+
+        return DepthUpdate(data.get('E'), data.get('s'), U, u, b, a)
@@ -3,4 +3,7 @@ class MessageOutOfSyncError(Exception):
     pass
 
 class SkipMessage(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class MalformedMessage(Exception):
+    pass
@@ -0,0 +1,49 @@
+from decimal import Decimal
+from typing import Union
+
+
+class FixedPointScale():
+    """
+    Scales prices and quantities to integers using the number of decimals in the
+    symbol's tick size and step size (from exchangeInfo PRICE_FILTER / LOT_SIZE), e.g.
+    tick_size "0.01" -> "26970.21000000" is stored as 2697021.
+    Decimals are only built when publishing.
+    """
+    def __init__(self, tick_size: str, step_size: str) -> None:
+        self.price_decimals = self._decimals(tick_size)
+        self.quantity_decimals = self._decimals(step_size)
+        self._price_exp = Decimal(1).scaleb(-self.price_decimals)
+        self._quantity_exp = Decimal(1).scaleb(-self.quantity_decimals)
+
+    def price_to_int(self, price: Union[str, int, float, Decimal]) -> int:
+        return self._to_int(price, self.price_decimals)
+
+    def quantity_to_int(self, quantity: Union[str, int, float, Decimal]) -> int:
+        return self._to_int(quantity, self.quantity_decimals)
+
+    def price_to_decimal(self, price: int) -> Decimal:
+        return Decimal(price).scaleb(-self.price_decimals).quantize(self._price_exp)
+
+    def quantity_to_decimal(self, quantity: int) -> Decimal:
+        return Decimal(quantity).scaleb(-self.quantity_decimals).quantize(self._quantity_exp)
+
+    @staticmethod
+    def _decimals(size: str) -> int:
+        exponent = Decimal(size).normalize().as_tuple().exponent
+        return max(0, -exponent)
+
+    @staticmethod
+    def _to_int(value, decimals: int) -> int:
+        if isinstance(value, str):
+            # fast path for the exchange's fixed format strings, no Decimal involved
+            whole, _, frac = value.partition(".")
+            if len(frac) > decimals:
+                if frac[decimals:].strip("0"):
+                    raise ValueError(f"{value} has more precision than {decimals} decimals")
+                frac = frac[:decimals]
+            return int(whole + frac.ljust(decimals, "0"))
+
+        scaled = Decimal(str(value)).scaleb(decimals)
+        if scaled != scaled.to_integral_value():
+            raise ValueError(f"{value} has more precision than {decimals} decimals")
+        return int(scaled)
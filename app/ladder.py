@@ -0,0 +1,197 @@
+import numpy as np
+from sortedcontainers import SortedDict
+
+
+class LadderOrderBook():
+    """
+    Dense tick ladder for liquid symbols. Works on fixed-point prices and quantities
+    (see FixedPointScale): quantities live in int64 arrays indexed by (price - base) // tick,
+    so updates are single array writes. Prices outside the window go to a sorted
+    spill-over dict, and the window is re-centred around mid when it drifts towards an edge.
+    Same interface as OrderBook, so it can be swapped in via OrderBookManager's orderbook_factory.
+    """
+    def __init__(self, size: int = 8192, tick: int = 1, margin: int = None) -> None:
+        self._size = size
+        self._tick = tick
+        # re-centre when mid gets within margin levels of either end of the window
+        self._margin = margin if margin is not None else size // 8
+        self._base = None
+        self._bid_qty = np.zeros(size, dtype=np.int64)
+        self._ask_qty = np.zeros(size, dtype=np.int64)
+        # best indices in the ladder, -1 / size when that side of the ladder is empty
+        self._best_bid_idx = -1
+        self._best_ask_idx = size
+        self._spill_bids = SortedDict()
+        self._spill_asks = SortedDict()
+        self._recentres = 0
+        self._last_update_id: int = 0
+
+    def top_bid(self):
+        best = None
+        if self._best_bid_idx >= 0:
+            best = self._price(self._best_bid_idx), int(self._bid_qty[self._best_bid_idx])
+        if self._spill_bids:
+            spill = self._spill_bids.peekitem(-1)
+            if best is None or spill[0] > best[0]:
+                best = spill
+        return best if best is not None else (0, 0)
+
+    def top_ask(self):
+        best = None
+        if self._best_ask_idx < self._size:
+            best = self._price(self._best_ask_idx), int(self._ask_qty[self._best_ask_idx])
+        if self._spill_asks:
+            spill = self._spill_asks.peekitem(0)
+            if best is None or spill[0] < best[0]:
+                best = spill
+        return best if best is not None else (0, 0)
+
+    def add_or_update_bid(self, price: int, quantity: int):
+        if self._base is None:
+            self._recentre(price)
+        idx = self._index(price)
+        if idx is None:
+            self._spill_bids[price] = quantity
+            if self._spill_bids.peekitem(-1)[0] == price:
+                self._check_drift()
+            return
+        self._bid_qty[idx] = quantity
+        if idx > self._best_bid_idx:
+            self._best_bid_idx = idx
+            self._check_drift()
+
+    def add_or_update_ask(self, price: int, quantity: int):
+        if self._base is None:
+            self._recentre(price)
+        idx = self._index(price)
+        if idx is None:
+            self._spill_asks[price] = quantity
+            if self._spill_asks.peekitem(0)[0] == price:
+                self._check_drift()
+            return
+        self._ask_qty[idx] = quantity
+        if idx < self._best_ask_idx:
+            self._best_ask_idx = idx
+            self._check_drift()
+
+    def remove_bid(self, price: int):
+        idx = self._index(price)
+        if idx is None:
+            self._spill_bids.pop(price, None)
+            return
+        self._bid_qty[idx] = 0
+        if idx == self._best_bid_idx:
+            self._best_bid_idx = self._last_nonzero(self._bid_qty[:idx])
+            self._check_drift()
+
+    def remove_ask(self, price: int):
+        idx = self._index(price)
+        if idx is None:
+            self._spill_asks.pop(price, None)
+            return
+        self._ask_qty[idx] = 0
+        if idx == self._best_ask_idx:
+            self._best_ask_idx = self._first_nonzero(self._ask_qty, idx + 1)
+            self._check_drift()
+
+    def bids_array(self):
+        # (prices, quantities) as int64 arrays, highest bid first
+        idx = np.flatnonzero(self._bid_qty)[::-1]
+        above, below = self._spill_split(self._spill_bids)
+        return (
+            np.concatenate([np.array(above[0][::-1], dtype=np.int64), self._prices(idx), np.array(below[0][::-1], dtype=np.int64)]),
+            np.concatenate([np.array(above[1][::-1], dtype=np.int64), self._bid_qty[idx], np.array(below[1][::-1], dtype=np.int64)]),
+        )
+
+    def asks_array(self):
+        # (prices, quantities) as int64 arrays, lowest ask first
+        idx = np.flatnonzero(self._ask_qty)
+        above, below = self._spill_split(self._spill_asks)
+        return (
+            np.concatenate([np.array(below[0], dtype=np.int64), self._prices(idx), np.array(above[0], dtype=np.int64)]),
+            np.concatenate([np.array(below[1], dtype=np.int64), self._ask_qty[idx], np.array(above[1], dtype=np.int64)]),
+        )
+
+    def cumulative_bids(self):
+        prices, quantities = self.bids_array()
+        return prices, np.cumsum(quantities)
+
+    def cumulative_asks(self):
+        prices, quantities = self.asks_array()
+        return prices, np.cumsum(quantities)
+
+    def iter_bids(self):
+        prices, quantities = self.bids_array()
+        return zip(prices.tolist(), quantities.tolist())
+
+    def iter_asks(self):
+        prices, quantities = self.asks_array()
+        return zip(prices.tolist(), quantities.tolist())
+
+    def _price(self, idx: int) -> int:
+        return self._base + idx * self._tick
+
+    def _prices(self, idx: np.ndarray) -> np.ndarray:
+        return self._base + idx.astype(np.int64) * self._tick
+
+    def _index(self, price: int):
+        if self._base is None:
+            return None
+        idx = (price - self._base) // self._tick
+        if 0 <= idx < self._size:
+            return idx
+        return None
+
+    def _spill_split(self, spill: SortedDict):
+        # spill levels above / below the window as ([prices], [quantities]), ascending
+        top = self._base + self._size * self._tick if self._base is not None else None
+        above, below = ([], []), ([], [])
+        for price, quantity in spill.items():
+            side = above if top is not None and price >= top else below
+            side[0].append(price)
+            side[1].append(quantity)
+        return above, below
+
+    @staticmethod
+    def _last_nonzero(qty: np.ndarray) -> int:
+        nonzero = np.flatnonzero(qty)
+        return int(nonzero[-1]) if len(nonzero) else -1
+
+    def _first_nonzero(self, qty: np.ndarray, start: int) -> int:
+        nonzero = np.flatnonzero(qty[start:])
+        return start + int(nonzero[0]) if len(nonzero) else self._size
+
+    def _check_drift(self):
+        bid, _ = self.top_bid()
+        ask, _ = self.top_ask()
+        if bid and ask:
+            mid = (bid + ask) // 2
+        else:
+            mid = bid or ask
+        if not mid:
+            return
+        idx = (mid - self._base) // self._tick
+        if idx < self._margin or idx >= self._size - self._margin:
+            self._recentre(mid)
+
+    def _recentre(self, centre: int):
+        new_base = centre - (self._size // 2) * self._tick
+        new_base -= (new_base - (self._base if self._base is not None else 0)) % self._tick
+        if self._base is not None:
+            # move ladder levels into the spill-over, then pull back whatever fits the new window
+            for qty, spill in ((self._bid_qty, self._spill_bids), (self._ask_qty, self._spill_asks)):
+                idx = np.flatnonzero(qty)
+                spill.update(zip(self._prices(idx).tolist(), qty[idx].tolist()))
+                qty[:] = 0
+            self._recentres += 1
+
+        self._base = new_base
+        top = new_base + self._size * self._tick
+        for qty, spill in ((self._bid_qty, self._spill_bids), (self._ask_qty, self._spill_asks)):
+            inside = list(spill.irange(new_base, top, inclusive=(True, False)))
+            if inside:
+                prices = np.array(inside, dtype=np.int64)
+                qty[(prices - new_base) // self._tick] = [spill.pop(p) for p in inside]
+
+        self._best_bid_idx = self._last_nonzero(self._bid_qty)
+        self._best_ask_idx = self._first_nonzero(self._ask_qty, 0)
@@ -1,13 +1,17 @@
 import asyncio
 import websockets
 from app.log_handler import logger
-import json
+from app.decoder import JsonDecoder
+from app.exceptions import MalformedMessage
+from typing import Dict, List
 
 
 class Listener:
-    def __init__(self, symbol: str, buffer: asyncio.Queue) -> None:
+    def __init__(self, symbol: str, buffer: asyncio.Queue, decoder=None) -> None:
         self.symbol = symbol
         self._buffer = buffer
+        # anything with decode(message), e.g. DepthUpdateDecoder
+        self._decoder = decoder or JsonDecoder()
         self._ping_interval = 5 # todo sensible value for this (seconds)
         self._timeout = 5 # todo sensible value for this (seconds)
 
@@ -44,17 +48,69 @@ class Listener:
         parsed = self._parse_message(message)
         if not parsed:
             return
-        if self._buffer.full():
+        await self._put(self._buffer, parsed)
+
+    async def _put(self, buffer: asyncio.Queue, parsed):
+        if buffer.full():
             logger.warning("<blue>buffer full, dropping message</blue>")
             # todo: this should overwrite / raise exception 
             return
         logger.debug(f"<blue>putting message {parsed['U']} on buffer</blue>")
-        await self._buffer.put(parsed)
-        
+        await buffer.put(parsed)
 
     def _parse_message(self, message):
         try:
-            return json.loads(message)
-        except ValueError:
-            logger.error(f"<blue>Unable to parse message: {message}</blue>")
+            return self._decoder.decode(message)
+        except (ValueError, MalformedMessage) as e:
+            logger.error(f"<blue>Unable to parse message: {message} ({e})</blue>")
             return None
+
+
+class CombinedListener(Listener):
+    """
+    Listens to several symbols over one connection using the combined stream endpoint and routes
+    each frame to its symbol's buffer. Frames are wrapped as {"stream": "<symbol>@depth", "data": {...}}.
+    """
+    def __init__(self, buffers: Dict[str, asyncio.Queue], decoder=None) -> None:
+        super().__init__(",".join(buffers), None, decoder)
+        self._buffers = {symbol.upper(): buffer for symbol, buffer in buffers.items()}
+
+    @property
+    def url(self):
+        streams = "/".join(f"{symbol.lower()}@depth" for symbol in self._buffers)
+        return f"wss://stream.binance.com:9443/stream?streams={streams}"
+
+    async def _process_message(self, message):
+        logger.debug("<blue>parse incoming message</blue>")
+        parsed = self._parse_message(message)
+        if not parsed:
+            return
+        # decoders may already have unwrapped the combined stream frame
+        data = parsed.get('data', parsed) if isinstance(parsed, dict) else parsed
+        try:
+            buffer = self._buffers.get(data['s'])
+        except (KeyError, TypeError):
+            buffer = None
+        if buffer is None:
+            logger.error(f"<blue>Unable to route message: {message}</blue>")
+            return
+        await self._put(buffer, data)
+
+
+def split_symbols(symbols: List[str], max_streams: int) -> List[List[str]]:
+    return [symbols[i:i + max_streams] for i in range(0, len(symbols), max_streams)]
+
+
+class MultiSymbolListener():
+    """
+    Spreads symbols over as many CombinedListener connections as needed. Binance allows up to 1024
+    streams per connection, the default stays well below that to keep urls and per-socket load small.
+    """
+    def __init__(self, buffers: Dict[str, asyncio.Queue], max_streams_per_connection: int = 200, decoder=None) -> None:
+        self.listeners = [
+            CombinedListener({symbol: buffers[symbol] for symbol in chunk}, decoder)
+            for chunk in split_symbols(list(buffers), max_streams_per_connection)
+        ]
+
+    async def run(self):
+        await asyncio.gather(*(listener.run() for listener in self.listeners))
@@ -1,13 +1,37 @@
 
 import asyncio
+import sys
+from app.decoder import DepthUpdateDecoder
+from app.fixedpoint import FixedPointScale
+from app.ladder import LadderOrderBook
 from app.listener import Listener
-from app.manager import OrderBookManager
+from app.manager import MultiSymbolManager, OrderBookManager
 from app.snapshot import Snapshotter
 
 
+# symbols liquid enough to use the dense ladder backend: symbol -> (tick size, step size)
+LADDER_SYMBOLS = {
+    "BTCUSDT": ("0.01", "0.00001"),
+}
+
+
+def build_manager(symbol: str, buffer) -> OrderBookManager:
+    if symbol in LADDER_SYMBOLS:
+        tick_size, step_size = LADDER_SYMBOLS[symbol]
+        return OrderBookManager(
+            symbol, buffer, Listener(symbol, buffer, DepthUpdateDecoder()), Snapshotter(),
+            scale=FixedPointScale(tick_size, step_size), orderbook_factory=LadderOrderBook,
+        )
+    return OrderBookManager(symbol, buffer, Listener(symbol, buffer, DepthUpdateDecoder()), Snapshotter())
+
+
 if __name__ == "__main__":
-    symbol = "BTCUSDT"
-    buffer = asyncio.Queue()
+    symbols = sys.argv[1:] or ["BTCUSDT"]
 
-    man = OrderBookManager(symbol, buffer, Listener(symbol, buffer), Snapshotter())
+    if len(symbols) == 1:
+        buffer = asyncio.Queue()
+        man = build_manager(symbols[0], buffer)
+    else:
+        # one combined stream connection per 200 symbols instead of a socket per symbol
+        man = MultiSymbolManager.build(symbols, Snapshotter(), decoder=DepthUpdateDecoder())
     asyncio.get_event_loop().run_until_complete(man.run())
@@ -1,18 +1,30 @@
 import asyncio
 import datetime as dt
+import time
 from decimal import Decimal
 from app.log_handler import logger
-from typing import Iterable, Union
-from app.listener import Listener
+from typing import Callable, Dict, Iterable, List, Union
+from app.listener import Listener, MultiSymbolListener
 from app.snapshot import Snapshotter
 from app.orderbook import OrderBook
+from app.fixedpoint import FixedPointScale
 from app.exceptions import MessageOutOfSyncError, SkipMessage
 
 
 class OrderBookManager:
-    def __init__(self, symbol: str, buffer, listener: Listener, snapshotter: Snapshotter) -> None:
+    def __init__(self, symbol: str, buffer, listener: Listener, snapshotter: Snapshotter, scale: FixedPointScale = None, orderbook_factory: Callable[[], OrderBook] = OrderBook, batch: bool = False) -> None:
         self._symbol = symbol
-        self._orderbook = OrderBook()
+        # e.g. LadderOrderBook for liquid symbols, which needs a fixed-point scale
+        self._orderbook_factory = orderbook_factory
+        self._orderbook = orderbook_factory()
+
+        # opt-in fixed-point mode: book holds scaled ints, Decimals are only built when publishing
+        self._scale = scale
+        if scale is None:
+            self._parse_price = self._parse_quantity = Decimal
+        else:
+            self._parse_price = scale.price_to_int
+            self._parse_quantity = scale.quantity_to_int
 
         self._buffer = buffer
         self._listener = listener
@@ -21,16 +33,27 @@ class OrderBookManager:
         self._period = 5
         self._is_first_message = True
         self._last_seen_id = 0
+        # drain the buffer in batches and apply merged levels once per batch
+        self._batch = batch
+        self.last_batch_stats = None
+        # exchange event time (ms) of the last applied message
+        self._last_event_time = None
 
     async def run(self):
         stream_task = asyncio.create_task(self.buffer_stream())
-        update_orderbook_task = asyncio.create_task(self.process_stream())
+        update_orderbook_task = asyncio.create_task(self.process())
         publish_orderbook = asyncio.create_task(self.publish_orderbook())
         await asyncio.gather(stream_task, update_orderbook_task, publish_orderbook)
 
     async def buffer_stream(self):
         await self._listener.run()
 
+    async def process(self):
+        if self._batch:
+            await self.process_stream_batched()
+        else:
+            await self.process_stream()
+
     async def fetch_snapshot(self):
         logger.debug(f"<green>fetching snapshot</green>")
         
@@ -38,23 +61,47 @@ class OrderBookManager:
     
     def reset_state(self):
         # todo: should the orderbook be reset or no..?
-        self._orderbook = OrderBook()
+        self._orderbook = self._orderbook_factory()
         self._snapshot = None
         self._last_seen_id = 0
         self._is_first_message = True
 
+    def top_of_book(self):
+        # ((bid price, bid quantity), (ask price, ask quantity)) as Decimals in either mode
+        bid = self._orderbook.top_bid()
+        ask = self._orderbook.top_ask()
+        if self._scale is None:
+            return bid, ask
+        return self._to_decimal_level(bid), self._to_decimal_level(ask)
+
+    def stats(self):
+        bid, ask = self.top_of_book()
+        return {
+            'bid': bid,
+            'ask': ask,
+            'last_update_id': self._orderbook._last_update_id,
+            'queue_size': self._buffer.qsize() if self._buffer is not None else 0,
+            'lag_ms': time.time() * 1000 - self._last_event_time if self._last_event_time else None,
+        }
+
+    def _to_decimal_level(self, level):
+        price, quantity = level
+        return self._scale.price_to_decimal(price), self._scale.quantity_to_decimal(quantity)
+
+    def log_top_of_book(self):
+        bid, ask = self.top_of_book()
+        timestamp = dt.datetime.utcnow()
+
+        top_bid = f"<red> {{'timestamp': {timestamp}, 'symbol': {self._symbol}, 'side': 'bid' 'price': {bid[0]}, 'quantity': {bid[1]} }} </red>"
+        top_ask= f"<red> {{'timestamp': {timestamp}, 'symbol': {self._symbol}, 'side': 'ask' 'price': {ask[0]}, 'quantity': {ask[1]} }} </red>"
+
+        logger.info(top_bid)
+        logger.info(top_ask)
+
     async def publish_orderbook(self):
         while True:
             try:
-                bid = self._orderbook.top_bid()
-                ask = self._orderbook.top_ask()
-                timestamp = dt.datetime.utcnow()
-                
-                top_bid = f"<red> {{'timestamp': {timestamp}, 'side': 'bid' 'price': {bid[0]}, 'quantity': {bid[1]} }} </red>"
-                top_ask= f"<red> {{'timestamp': {timestamp}, 'side': 'ask' 'price': {ask[0]}, 'quantity': {ask[1]} }} </red>"
-
-                logger.info(top_bid)
-                logger.info(top_ask)
+                self.log_top_of_book()
                 await asyncio.sleep(self._period)
             except Exception as e:
                 logger.error(f"<red>Unexpected error: {e}</red>")
@@ -88,6 +135,81 @@ class OrderBookManager:
                 logger.error(f"Unexpected error: {e}")
                 continue
 
+    async def process_stream_batched(self):
+        # same as process_stream, but handles everything available on the buffer in one go
+        while True:
+            try:
+                logger.debug(f"<green>waiting for messages from queue</green>")
+                messages = await self._drain_buffer()
+                logger.debug(f"<green>Received {len(messages)} messages from queue</green>")
+                await self._handle_batch(messages)
+
+            except asyncio.CancelledError:
+                logger.info("<green>Event loop cancelled from manager exiting</green>")
+                break
+
+            except Exception as e:
+                logger.error(f"Unexpected error: {e}")
+                continue
+
+    async def _drain_buffer(self):
+        messages = [await self._buffer.get()]
+        while True:
+            try:
+                messages.append(self._buffer.get_nowait())
+            except asyncio.QueueEmpty:
+                return messages
+
+    async def _handle_batch(self, messages):
+        # levels are merged per price across the batch (last write wins) and applied once,
+        # ending in the same state as handling the messages one by one
+        start = time.time()
+        bids, asks = {}, {}
+        levels_received = 0
+        last_update_id = None
+
+        try:
+            for message in messages:
+                if self._is_first_message:
+                    try:
+                        await self._compare_snapshot(message)
+                    except SkipMessage:
+                        logger.info("<green>Skipping message</green>")
+                        continue
+
+                if message['U'] != self._last_seen_id + 1:
+                    logger.warning(f"<green>message is not next in sequence! Received {message['U']}, expected {self._last_seen_id + 1}</green>")
+                    logger.debug(f"<green>Message out of sync... restart with new snapshot??</green>")
+                    self.reset_state()
+                    bids.clear()
+                    asks.clear()
+                    last_update_id = None
+                    continue
+
+                bids.update(self._parse_levels(message['b']))
+                asks.update(self._parse_levels(message['a']))
+                levels_received += len(message['b']) + len(message['a'])
+                self._last_seen_id = last_update_id = message['u']
+                self._last_event_time = message.get('E', self._last_event_time)
+        finally:
+            if last_update_id is not None:
+                self._apply_levels(last_update_id, bids.items(), asks.items())
+            self._record_batch_stats(messages, start, levels_received, len(bids) + len(asks))
+
+    def _record_batch_stats(self, messages, start: float, levels_received: int, levels_applied: int):
+        now = time.time()
+        # event time (ms) of the oldest message in the batch, if the exchange sent one
+        event_time = messages[0].get('E')
+        self.last_batch_stats = {
+            'size': len(messages),
+            'levels_received': levels_received,
+            'levels_applied': levels_applied,
+            'queue_size': self._buffer.qsize(),
+            'lag_ms': now * 1000 - event_time if event_time else None,
+            'processing_ms': (now - start) * 1000,
+        }
+        logger.debug(f"<green>batch stats: {self.last_batch_stats}</green>")
+
     async def _handle_message(self, message):
 
         logger.debug(f"<green>Processing {message['U']} - {message['u']}</green>")
@@ -101,6 +223,7 @@ class OrderBookManager:
         
         self._update_orderbook(message['u'], message['b'], message['a'])
         self._last_seen_id = message['u']
+        self._last_event_time = message.get('E', self._last_event_time)
 
     async def _compare_snapshot(self, message):
         
@@ -135,19 +258,24 @@ class OrderBookManager:
         raise NotImplementedError(f"<green>Unexpected - U:{U}, u:{u}, last_update_id:{last_update_id}</green>")
 
     def _update_orderbook(self, last_update_id: int, bids: Iterable[Iterable[Union[str, int]]], asks: Iterable[Iterable[Union[str, int]]]):
-        logger.debug(f"<green>Updating orderbook with {last_update_id}</green>")
-        for bid in bids:
-            
-            price, quantity = [Decimal(x) for x in bid]
+        self._apply_levels(last_update_id, self._parse_levels(bids), self._parse_levels(asks))
+
+    def _parse_levels(self, levels: Iterable[Iterable[Union[str, int]]]):
+        parse_price = self._parse_price
+        parse_quantity = self._parse_quantity
+        for level in levels:
+            yield parse_price(level[0]), parse_quantity(level[1])
 
+    def _apply_levels(self, last_update_id: int, bids, asks):
+        # bids, asks: iterables of parsed (price, quantity)
+        logger.debug(f"<green>Updating orderbook with {last_update_id}</green>")
+        for price, quantity in bids:
             if quantity == 0:
                 self._orderbook.remove_bid(price)
             else:
                 self._orderbook.add_or_update_bid(price, quantity)
 
-        for ask in asks:
-            price, quantity = [Decimal(x) for x in ask]
-
+        for price, quantity in asks:
             if quantity == 0:
                 self._orderbook.remove_ask(price)
             else:
@@ -155,8 +283,44 @@ class OrderBookManager:
         
         self._orderbook._last_update_id = last_update_id
         logger.debug(f"<green>orderbook updated to {last_update_id}</green>")
-       
 
 
+class MultiSymbolManager:
+    """
+    Runs one OrderBookManager per symbol off a shared MultiSymbolListener, so hundreds of symbols
+    share a handful of websocket connections. Each symbol keeps its own buffer, book and sequence
+    state, so a slow snapshot for one symbol does not hold up the others.
+    """
+    def __init__(self, managers: Dict[str, OrderBookManager], listener: MultiSymbolListener) -> None:
+        self.managers = managers
+        self._listener = listener
+        self._period = 5
+
+    @classmethod
+    def build(cls, symbols: List[str], snapshotter: Snapshotter, max_streams_per_connection: int = 200, decoder=None, **manager_kwargs):
+        buffers = {symbol.upper(): asyncio.Queue() for symbol in symbols}
+        listener = MultiSymbolListener(buffers, max_streams_per_connection, decoder)
+        managers = {
+            symbol: OrderBookManager(symbol, buffer, listener, snapshotter, **manager_kwargs)
+            for symbol, buffer in buffers.items()
+        }
+        return cls(managers, listener)
+
+    async def run(self):
+        tasks = [asyncio.create_task(self._listener.run())]
+        tasks += [asyncio.create_task(manager.process()) for manager in self.managers.values()]
+        tasks.append(asyncio.create_task(self.publish_orderbook()))
+        await asyncio.gather(*tasks)
+
+    def stats(self):
+        return {symbol: manager.stats() for symbol, manager in self.managers.items()}
 
-    
\ No newline at end of file
+    async def publish_orderbook(self):
+        while True:
+            try:
+                for manager in self.managers.values():
+                    manager.log_top_of_book()
+                await asyncio.sleep(self._period)
+            except Exception as e:
+                logger.error(f"<red>Unexpected error: {e}</red>")
+                continue
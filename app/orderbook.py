@@ -1,39 +1,53 @@
-from collections import OrderedDict
 from decimal import Decimal
+from sortedcontainers import SortedDict
 
 
 class OrderBook():
     def __init__(self) -> None:
-        # key,value: (price, quantity)
-        self._bids:OrderedDict = {}
-        self._asks:OrderedDict = {}
+        # key,value: (price, quantity), kept sorted by price ascending
+        self._bids: SortedDict = SortedDict()
+        self._asks: SortedDict = SortedDict()
         self._last_update_id: int = 0
+        # cached best prices, None when the side is empty
+        self._best_bid = None
+        self._best_ask = None
 
     def top_ask(self):
         # lowest ask -> key,value: (price, quantity)
-        if self._asks:
-            price = min(self._asks.keys())
-            return price, self._asks[price]
+        if self._best_ask is not None:
+            return self._best_ask, self._asks[self._best_ask]
         return 0, 0
-    
+
     def top_bid(self):
         # highest bid
-        if self._bids:
-            price = max(self._bids.keys())
-            return price, self._bids[price]
+        if self._best_bid is not None:
+            return self._best_bid, self._bids[self._best_bid]
         return 0, 0
 
-    def remove_bid(self, price:Decimal):
-        self._bids.pop(price, None)
+    def iter_bids(self):
+        # highest to lowest -> (price, quantity)
+        for price in reversed(self._bids):
+            yield price, self._bids[price]
+
+    def iter_asks(self):
+        # lowest to highest -> (price, quantity)
+        for price in self._asks:
+            yield price, self._asks[price]
+
+    def remove_bid(self, price: Decimal):
+        if self._bids.pop(price, None) is not None and price == self._best_bid:
+            self._best_bid = self._bids.peekitem(-1)[0] if self._bids else None
 
-    def remove_ask(self, price:Decimal):
-        self._asks.pop(price, None)
+    def remove_ask(self, price: Decimal):
+        if self._asks.pop(price, None) is not None and price == self._best_ask:
+            self._best_ask = self._asks.peekitem(0)[0] if self._asks else None
 
-    def add_or_update_bid(self, price:Decimal, quantity:Decimal):
+    def add_or_update_bid(self, price: Decimal, quantity: Decimal):
         self._bids[price] = quantity
+        if self._best_bid is None or price > self._best_bid:
+            self._best_bid = price
 
     def add_or_update_ask(self, price: Decimal, quantity: Decimal):
         self._asks[price] = quantity
-
-    
-
+        if self._best_ask is None or price < self._best_ask:
+            self._best_ask = price
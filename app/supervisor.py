@@ -0,0 +1,154 @@
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Callable, Dict, List
+from app.decoder import DepthUpdateDecoder
+from app.log_handler import logger
+from app.manager import MultiSymbolManager
+from app.snapshot import Snapshotter
+
+
+def shard_symbols(symbols: List[str], n_workers: int) -> List[List[str]]:
+    # round robin so the (usually most liquid) first symbols end up on different workers
+    return [symbols[i::n_workers] for i in range(n_workers) if symbols[i::n_workers]]
+
+
+def build_multi_symbol_manager(symbols: List[str]) -> MultiSymbolManager:
+    return MultiSymbolManager.build(symbols, Snapshotter(), decoder=DepthUpdateDecoder())
+
+
+def run_worker(worker_id: int, symbols: List[str], stats_queue, build_manager: Callable, stats_interval: float):
+    # entry point of a worker process: its own event loop, listener(s) and managers
+    asyncio.run(_worker_main(worker_id, symbols, stats_queue, build_manager, stats_interval))
+
+
+async def _worker_main(worker_id: int, symbols: List[str], stats_queue, build_manager: Callable, stats_interval: float):
+    manager = build_manager(symbols)
+    task = asyncio.create_task(manager.run())
+    while not task.done():
+        stats_queue.put({
+            'worker_id': worker_id,
+            'pid': os.getpid(),
+            'time': time.time(),
+            'symbols': manager.stats(),
+        })
+        await asyncio.sleep(stats_interval)
+    # surface the error, the supervisor restarts the worker once the process exits
+    task.result()
+
+
+class Supervisor():
+    """
+    Splits symbols across worker processes, each running its own MultiSymbolManager, so decoding
+    and book updates are not limited to one core. Workers report their stats over a queue, the
+    supervisor restarts any worker that dies or stops reporting, and publishes one consolidated
+    top-of-book view across all workers.
+    """
+    def __init__(self, symbols: List[str], n_workers: int = None, build_manager: Callable = build_multi_symbol_manager, stats_interval: float = 1, heartbeat_timeout: float = 30, context=None) -> None:
+        # spawn rather than fork: the log handler runs a background thread
+        self._context = context or mp.get_context("spawn")
+        self._shards = shard_symbols(symbols, n_workers or os.cpu_count())
+        self._build_manager = build_manager
+        self._stats_interval = stats_interval
+        self._heartbeat_timeout = heartbeat_timeout
+        self._stats_queue = self._context.Queue()
+        self._period = 5
+
+        self._processes: Dict[int, mp.Process] = {}
+        self._started: Dict[int, float] = {}
+        self.restarts = {worker_id: 0 for worker_id in range(len(self._shards))}
+        # latest report per worker and latest stats per symbol
+        self.worker_stats: Dict[int, dict] = {}
+        self.symbol_stats: Dict[str, dict] = {}
+
+    async def run(self):
+        self.start()
+        try:
+            await asyncio.gather(self.monitor(), self.publish_orderbook())
+        finally:
+            self.stop()
+
+    def start(self):
+        for worker_id in range(len(self._shards)):
+            self._start_worker(worker_id)
+
+    def stop(self):
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            process.join(timeout=5)
+
+    def _start_worker(self, worker_id: int):
+        process = self._context.Process(
+            target=run_worker,
+            args=(worker_id, self._shards[worker_id], self._stats_queue, self._build_manager, self._stats_interval),
+            name=f"orderbook-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._started[worker_id] = time.time()
+        logger.info(f"<magenta>started worker {worker_id} (pid {process.pid}) for {len(self._shards[worker_id])} symbols</magenta>")
+
+    async def monitor(self):
+        while True:
+            try:
+                self.collect_stats()
+                self.check_workers()
+                await asyncio.sleep(self._stats_interval)
+            except asyncio.CancelledError:
+                logger.info("<magenta>Event loop cancelled from supervisor exiting</magenta>")
+                break
+            except Exception as e:
+                logger.error(f"<magenta>Unexpected error: {e}</magenta>")
+                continue
+
+    def collect_stats(self):
+        while True:
+            try:
+                report = self._stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.worker_stats[report['worker_id']] = report
+            self.symbol_stats.update(report['symbols'])
+
+    def check_workers(self):
+        now = time.time()
+        for worker_id, process in list(self._processes.items()):
+            report = self.worker_stats.get(worker_id)
+            last_seen = max(report['time'] if report and report['pid'] == process.pid else 0, self._started[worker_id])
+
+            if not process.is_alive():
+                logger.warning(f"<magenta>worker {worker_id} (pid {process.pid}) died with exit code {process.exitcode}, restarting</magenta>")
+            elif now - last_seen > self._heartbeat_timeout:
+                logger.warning(f"<magenta>worker {worker_id} (pid {process.pid}) has not reported for {now - last_seen:.1f}s, restarting</magenta>")
+                process.terminate()
+                process.join(timeout=5)
+            else:
+                continue
+
+            self.restarts[worker_id] += 1
+            self._start_worker(worker_id)
+
+    def consolidated_top_of_book(self):
+        # symbol -> (bid, ask) across all workers
+        return {symbol: (stats['bid'], stats['ask']) for symbol, stats in self.symbol_stats.items()}
+
+    async def publish_orderbook(self):
+        while True:
+            try:
+                for symbol, (bid, ask) in sorted(self.consolidated_top_of_book().items()):
+                    logger.info(f"<red> {{'symbol': {symbol}, 'bid': {bid[0]}, 'bid_quantity': {bid[1]}, 'ask': {ask[0]}, 'ask_quantity': {ask[1]} }} </red>")
+                await asyncio.sleep(self._period)
+            except Exception as e:
+                logger.error(f"<red>Unexpected error: {e}</red>")
+                continue
+
+
+if __name__ == "__main__":
+    import sys
+
+    asyncio.run(Supervisor(sys.argv[1:] or ["BTCUSDT"]).run())
@@ -0,0 +1,49 @@
+import json
+import os
+import pytest
+from app.decoder import DepthUpdate, DepthUpdateDecoder, JsonDecoder
+from app.exceptions import MalformedMessage
+
+
+@pytest.fixture
+def raw_message() -> str:
+    fp = os.path.join(os.path.dirname(__file__), "data/first_message.json")
+    with open(fp, "r") as f:
+        return f.read()
+
+
+def test_decode(raw_message):
+    expected = JsonDecoder().decode(raw_message)
+    update = DepthUpdateDecoder().decode(raw_message)
+
+    assert isinstance(update, DepthUpdate)
+    for key in ("E", "s", "U", "u", "b", "a"):
+        assert update[key] == expected[key]
+    assert update.get("missing") is None
+    with pytest.raises(KeyError):
+        update["missing"]
+
+
+def test_decode_combined_frame(raw_message):
+    frame = json.dumps({"stream": "btcusdt@depth", "data": json.loads(raw_message)})
+    assert DepthUpdateDecoder().decode(frame) == DepthUpdateDecoder().decode(raw_message)
+
+
+@pytest.mark.parametrize("change", [
+    {"e": "trade"},
+    {"U": "36888211887"},
+    {"u": 1},
+    {"b": "26906.50000000"},
+    {"a": [["26906.50000000"]]},
+    {"b": [["26906.50000000", "1", "2"]]},
+])
+def test_decode_malformed(raw_message, change):
+    message = json.dumps({**json.loads(raw_message), **change})
+    with pytest.raises(MalformedMessage):
+        DepthUpdateDecoder().decode(message)
+
+
+@pytest.mark.parametrize("message", ["not json", "[]", '{"result": null, "id": 1}'])
+def test_decode_unexpected(message):
+    with pytest.raises(MalformedMessage):
+        DepthUpdateDecoder().decode(message)
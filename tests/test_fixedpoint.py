@@ -0,0 +1,35 @@
+import pytest
+from decimal import Decimal
+from app.fixedpoint import FixedPointScale
+
+
+@pytest.fixture
+def scale():
+    return FixedPointScale(tick_size="0.01000000", step_size="0.00001000")
+
+
+def test_decimals(scale):
+    assert scale.price_decimals == 2
+    assert scale.quantity_decimals == 5
+    assert FixedPointScale("1.00000000", "1").price_decimals == 0
+
+
+def test_to_int(scale):
+    assert scale.price_to_int("26970.21000000") == 2697021
+    assert scale.price_to_int("26970") == 2697000
+    assert scale.price_to_int(Decimal("26970.21000000")) == 2697021
+    assert scale.quantity_to_int("0.18092000") == 18092
+    assert scale.quantity_to_int("0.00000000") == 0
+
+
+def test_to_int_too_precise(scale):
+    with pytest.raises(ValueError):
+        scale.price_to_int("26970.21500000")
+
+    with pytest.raises(ValueError):
+        scale.price_to_int(Decimal("26970.215"))
+
+
+def test_to_decimal(scale):
+    assert scale.price_to_decimal(2697021) == Decimal("26970.21000000")
+    assert scale.quantity_to_decimal(18092) == Decimal("0.18092000")
@@ -0,0 +1,66 @@
+import random
+import numpy as np
+import pytest
+from app.ladder import LadderOrderBook
+from app.orderbook import OrderBook
+
+
+def apply(books, side, price, quantity):
+    for book in books:
+        if quantity == 0:
+            getattr(book, f"remove_{side}")(price)
+        else:
+            getattr(book, f"add_or_update_{side}")(price, quantity)
+
+
+@pytest.fixture
+def random_updates():
+    rng = random.Random(42)
+    mid = 2697000
+    updates = []
+    for _ in range(5000):
+        mid += rng.randint(-3, 3)
+        side = rng.choice(["bid", "ask"])
+        offset = int(rng.expovariate(1 / 20)) + 1
+        # the odd far-off level, like the 13485 bids in the stream fixture
+        if rng.random() < 0.02:
+            offset *= 1000
+        price = mid - offset if side == "bid" else mid + offset
+        quantity = 0 if rng.random() < 0.4 else rng.randint(1, 10**6)
+        updates.append((side, price, quantity))
+    return updates
+
+
+def test_matches_orderbook(random_updates):
+    reference = OrderBook()
+    ladder = LadderOrderBook(size=256)
+
+    for side, price, quantity in random_updates:
+        apply([reference, ladder], side, price, quantity)
+        assert ladder.top_bid() == reference.top_bid()
+        assert ladder.top_ask() == reference.top_ask()
+
+    assert ladder._recentres > 0
+    assert ladder._spill_bids or ladder._spill_asks
+    assert list(ladder.iter_bids()) == list(reference.iter_bids())
+    assert list(ladder.iter_asks()) == list(reference.iter_asks())
+
+
+def test_cumulative(random_updates):
+    reference = OrderBook()
+    ladder = LadderOrderBook(size=256)
+    for side, price, quantity in random_updates:
+        apply([reference, ladder], side, price, quantity)
+
+    prices, cumulative = ladder.cumulative_bids()
+    expected = list(reference.iter_bids())
+    assert prices.tolist() == [p for p, _ in expected]
+    assert cumulative.tolist() == np.cumsum([q for _, q in expected]).tolist()
+
+
+def test_empty():
+    ladder = LadderOrderBook()
+    assert ladder.top_bid() == (0, 0)
+    assert ladder.top_ask() == (0, 0)
+    ladder.remove_bid(100)
+    assert list(ladder.iter_asks()) == []
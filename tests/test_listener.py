@@ -0,0 +1,46 @@
+import asyncio
+import json
+import pytest
+from app.decoder import DepthUpdateDecoder
+from app.listener import CombinedListener, split_symbols
+
+
+@pytest.fixture
+def buffers():
+    return {"BTCUSDT": asyncio.Queue(), "ETHUSDT": asyncio.Queue()}
+
+
+def test_combined_url(buffers):
+    listener = CombinedListener(buffers)
+    assert listener.url == "wss://stream.binance.com:9443/stream?streams=btcusdt@depth/ethusdt@depth"
+
+
+def test_split_symbols():
+    assert split_symbols(["A", "B", "C"], 2) == [["A", "B"], ["C"]]
+    assert split_symbols(["A", "B"], 2) == [["A", "B"]]
+
+
+@pytest.mark.asyncio
+async def test_combined_routing(buffers, sample_stream_message):
+    listener = CombinedListener(buffers)
+    frame = {"stream": "btcusdt@depth", "data": sample_stream_message}
+
+    await listener._process_message(json.dumps(frame))
+    await listener._process_message(json.dumps({"stream": "xrpusdt@depth", "data": {**sample_stream_message, "s": "XRPUSDT"}}))
+    await listener._process_message("not json")
+
+    assert buffers["BTCUSDT"].qsize() == 1
+    assert buffers["ETHUSDT"].qsize() == 0
+    assert buffers["BTCUSDT"].get_nowait() == sample_stream_message
+
+
+@pytest.mark.asyncio
+async def test_combined_routing_depth_update_decoder(buffers, sample_stream_message):
+    listener = CombinedListener(buffers, DepthUpdateDecoder())
+
+    await listener._process_message(json.dumps({"stream": "ethusdt@depth", "data": {**sample_stream_message, "s": "ETHUSDT"}}))
+    await listener._process_message(json.dumps({"stream": "ethusdt@depth", "data": {**sample_stream_message, "b": None}}))
+
+    assert buffers["ETHUSDT"].qsize() == 1
+    update = buffers["ETHUSDT"].get_nowait()
+    assert update['U'] == sample_stream_message['U']
@@ -1,9 +1,12 @@
+import asyncio
 import pytest
 from app.listener import Listener
 from decimal import Decimal
 import numpy as np
 from app.snapshot import Snapshotter
-from app.manager import OrderBookManager
+from app.manager import MultiSymbolManager, OrderBookManager
+from app.fixedpoint import FixedPointScale
+from app.ladder import LadderOrderBook
 from app.exceptions import MessageOutOfSyncError, SkipMessage
 
 
@@ -307,3 +310,88 @@ def test__update_orderbook(order_book_manager):
     assert Decimal("30000.12300000") not in order_book_manager._orderbook._asks.keys()
 
 
+@pytest.mark.asyncio
+async def test__handle_message_fixed_point(mocker, sample_snapshot, ordered_stream):
+    mocker.patch.object(
+        OrderBookManager, "fetch_snapshot", return_value=sample_snapshot
+    )
+    scale = FixedPointScale(tick_size="0.01000000", step_size="0.00001000")
+    manager = OrderBookManager("BTCUSDT", None, Listener, Snapshotter(), scale=scale)
+
+    for message, expected_tob in ordered_stream:
+        await manager._handle_message(message)
+        assert isinstance(manager._orderbook.top_bid()[0], int)
+        assert manager.top_of_book() == expected_tob
+
+
+@pytest.mark.asyncio
+async def test__handle_message_ladder(mocker, sample_snapshot, ordered_stream):
+    mocker.patch.object(
+        OrderBookManager, "fetch_snapshot", return_value=sample_snapshot
+    )
+    scale = FixedPointScale(tick_size="0.01000000", step_size="0.00001000")
+    manager = OrderBookManager("BTCUSDT", None, Listener, Snapshotter(), scale=scale, orderbook_factory=LadderOrderBook)
+
+    for message, expected_tob in ordered_stream:
+        await manager._handle_message(message)
+        assert manager.top_of_book() == expected_tob
+
+    manager.reset_state()
+    assert isinstance(manager._orderbook, LadderOrderBook)
+
+
+@pytest.mark.asyncio
+async def test__handle_batch_matches_sequential(mocker, sample_snapshot, ordered_stream):
+    mocker.patch.object(
+        OrderBookManager, "fetch_snapshot", return_value=sample_snapshot
+    )
+    sequential = OrderBookManager("BTCUSDT", None, Listener, Snapshotter())
+    for message, _ in ordered_stream:
+        await sequential._handle_message(message)
+
+    buffer = asyncio.Queue()
+    for message, _ in ordered_stream:
+        buffer.put_nowait(message)
+    batched = OrderBookManager("BTCUSDT", buffer, Listener, Snapshotter(), batch=True)
+
+    messages = await batched._drain_buffer()
+    assert len(messages) == len(ordered_stream)
+    await batched._handle_batch(messages)
+
+    assert batched._last_seen_id == sequential._last_seen_id
+    assert dict(batched._orderbook._bids) == dict(sequential._orderbook._bids)
+    assert dict(batched._orderbook._asks) == dict(sequential._orderbook._asks)
+    assert batched._orderbook.top_bid() == ordered_stream[-1][1][0]
+    assert batched._orderbook.top_ask() == ordered_stream[-1][1][1]
+
+    stats = batched.last_batch_stats
+    assert stats['size'] == len(ordered_stream)
+    assert stats['queue_size'] == 0
+    assert stats['levels_applied'] < stats['levels_received']
+
+
+@pytest.mark.asyncio
+async def test__handle_batch_out_of_sync(mocker, sample_snapshot, unordered_stream, second_snapshot):
+    mocker.patch.object(
+        OrderBookManager, "fetch_snapshot", side_effect=[sample_snapshot, second_snapshot]
+    )
+    manager = OrderBookManager("BTCUSDT", asyncio.Queue(), Listener, Snapshotter(), batch=True)
+
+    # gap after the first message resets, the third message then lines up with the second snapshot
+    await manager._handle_batch([message for message, _ in unordered_stream])
+
+    _, expected_tob = unordered_stream[2]
+    assert manager._last_seen_id == unordered_stream[2][0]['u']
+    assert expected_tob[0] == manager._orderbook.top_bid()
+    assert expected_tob[1] == manager._orderbook.top_ask()
+
+
+def test_multi_symbol_manager_build():
+    symbols = [f"SYM{i}USDT" for i in range(5)]
+    multi = MultiSymbolManager.build(symbols, Snapshotter(), max_streams_per_connection=2)
+
+    assert list(multi.managers) == symbols
+    assert [len(listener._buffers) for listener in multi._listener.listeners] == [2, 2, 1]
+    for symbol, manager in multi.managers.items():
+        assert manager._listener is multi._listener
+        assert manager._buffer is multi._listener.listeners[symbols.index(symbol) // 2]._buffers[symbol]
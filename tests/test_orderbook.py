@@ -41,4 +41,32 @@ def test_top_bid(orderbook: OrderBook, top_bid: Decimal):
 
 
 def test_top_ask(orderbook: OrderBook, top_ask: Decimal):
-    assert orderbook.top_ask() == top_ask, f"Top ask should be {top_ask}"
\ No newline at end of file
+    assert orderbook.top_ask() == top_ask, f"Top ask should be {top_ask}"
+
+
+def test_remove_top_bid(orderbook: OrderBook, top_bid: Decimal):
+    orderbook.remove_bid(top_bid[0])
+    assert orderbook.top_bid() == (Decimal(10.003), Decimal(10))
+
+
+def test_remove_top_ask(orderbook: OrderBook, top_ask: Decimal):
+    orderbook.remove_ask(top_ask[0])
+    assert orderbook.top_ask() == (Decimal(9.234), Decimal(10))
+
+
+def test_remove_last_level():
+    ob = OrderBook()
+    ob.add_or_update_bid(Decimal(1), Decimal(1))
+    ob.add_or_update_ask(Decimal(2), Decimal(1))
+    ob.remove_bid(Decimal(1))
+    ob.remove_ask(Decimal(2))
+    assert ob.top_bid() == (0, 0)
+    assert ob.top_ask() == (0, 0)
+
+
+def test_iter_bids(orderbook: OrderBook, bids):
+    assert list(orderbook.iter_bids()) == sorted(bids, reverse=True)
+
+
+def test_iter_asks(orderbook: OrderBook, asks):
+    assert list(orderbook.iter_asks()) == sorted(asks)
@@ -0,0 +1,78 @@
+import asyncio
+import time
+import pytest
+from decimal import Decimal
+from app.manager import MultiSymbolManager, OrderBookManager
+from app.supervisor import Supervisor, shard_symbols
+
+
+class FakeListener:
+    # local stand-in for the websocket feed: chained depth updates for every symbol
+    def __init__(self, buffers):
+        self._buffers = buffers
+
+    async def run(self):
+        first_id = 5
+        while True:
+            for symbol, buffer in self._buffers.items():
+                await buffer.put({
+                    "e": "depthUpdate", "E": time.time() * 1000, "s": symbol,
+                    "U": first_id, "u": first_id + 9,
+                    "b": [["100.00", "1.5"]], "a": [["101.00", "2.5"]],
+                })
+            first_id += 10
+            await asyncio.sleep(0.01)
+
+
+class FakeSnapshotter:
+    async def fetch_latest(self, symbol):
+        return 10, [["99.00", "1.0"]], [["102.00", "1.0"]]
+
+
+def build_fake_manager(symbols):
+    buffers = {symbol: asyncio.Queue() for symbol in symbols}
+    listener = FakeListener(buffers)
+    managers = {symbol: OrderBookManager(symbol, buffer, listener, FakeSnapshotter()) for symbol, buffer in buffers.items()}
+    return MultiSymbolManager(managers, listener)
+
+
+async def wait_until(supervisor, condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        supervisor.collect_stats()
+        supervisor.check_workers()
+        if condition():
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError("condition not met before timeout")
+
+
+def test_shard_symbols():
+    assert shard_symbols(["A", "B", "C", "D", "E"], 2) == [["A", "C", "E"], ["B", "D"]]
+    assert shard_symbols(["A"], 3) == [["A"]]
+
+
+@pytest.mark.asyncio
+async def test_supervisor_restarts_dead_worker():
+    symbols = ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+    supervisor = Supervisor(
+        symbols, n_workers=2, build_manager=build_fake_manager, stats_interval=0.05,
+        heartbeat_timeout=10,
+    )
+    supervisor.start()
+    try:
+        await wait_until(supervisor, lambda: set(supervisor.symbol_stats) == set(symbols)
+                         and all(stats['last_update_id'] > 10 for stats in supervisor.symbol_stats.values()))
+
+        tob = supervisor.consolidated_top_of_book()
+        assert tob["BBBUSDT"] == ((Decimal("100.00"), Decimal("1.5")), (Decimal("101.00"), Decimal("2.5")))
+        assert supervisor.worker_stats[0]['symbols'].keys() == {"AAAUSDT", "CCCUSDT"}
+
+        pid = supervisor._processes[1].pid
+        supervisor._processes[1].kill()
+        supervisor._processes[1].join()
+
+        await wait_until(supervisor, lambda: supervisor.restarts[1] == 1 and supervisor.worker_stats[1]['pid'] != pid)
+        assert supervisor.restarts[0] == 0
+    finally:
+        supervisor.stop()